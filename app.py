@@ -11,12 +11,25 @@ This module contains:
 
 import os
 import logging
+import time
 from flask import (
     Flask, render_template, request, jsonify, redirect, url_for,
-    flash, session
+    flash, session, make_response
 )
 from flask_socketio import SocketIO, emit, join_room, leave_room
 
+# Fast JSON encoding for broadcast payloads; falls back to stdlib
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
+
 from config import get_config
 from models import init_db, Poll, Option, Vote, generate_browser_token
 from services.poll_service import (
@@ -32,6 +45,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Scoped session factory, set by create_app (module-level so socket
+# handlers can reach it outside the request cycle)
+SessionLocal = None
+
 # Initialize SocketIO with eventlet for async support
 socketio = SocketIO(
     cors_allowed_origins="*",
@@ -43,9 +60,85 @@ socketio = SocketIO(
 # Global rate limiter instance
 rate_limiter = RateLimiter(
     max_requests=int(os.environ.get('RATE_LIMIT_REQUESTS', 10)),
-    window_seconds=int(os.environ.get('RATE_LIMIT_WINDOW', 60))
+    window_seconds=int(os.environ.get('RATE_LIMIT_WINDOW', 60)),
+    redis_url=os.environ.get('RATE_LIMIT_REDIS_URL')
 )
 
+# Short-TTL results cache: poll_code -> (monotonic timestamp, results).
+# Read-heavy polls hit /results and request_results far more often than
+# results actually change; a sub-second TTL collapses those reads to one
+# DB hit per interval. Entries are dropped when a vote lands.
+RESULTS_CACHE_TTL_SECONDS = 0.5
+_results_cache = {}
+
+
+def get_cached_results(poll_code, db_session):
+    """
+    Get results for a poll, served from the TTL cache when fresh.
+
+    Args:
+        poll_code: The poll code (uppercased)
+        db_session: Database session for the cache-miss path
+
+    Returns:
+        dict: Results payload
+    """
+    cached = _results_cache.get(poll_code)
+    now = time.monotonic()
+
+    if cached is not None and now - cached[0] < RESULTS_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    results = PollService(db_session).get_results(poll_code)
+    _results_cache[poll_code] = (now, results)
+    return results
+
+
+# Coalesced broadcast state: latest pending snapshot per poll room and
+# the set of rooms that already have a flush scheduled. Results are
+# cumulative snapshots, so intermediate ones can safely be dropped.
+BROADCAST_COALESCE_SECONDS = 0.1
+_pending_broadcasts = {}
+_scheduled_broadcasts = set()
+
+# Last snapshot emitted to each room, stored pre-serialized so
+# reconnecting clients resync without a DB query or a re-encode
+# (serialize once, send many)
+_last_broadcast = {}
+
+
+def schedule_broadcast(poll_code, poll_results):
+    """
+    Schedule a coalesced 'vote_update' broadcast for a poll room.
+
+    Stores the latest results snapshot and emits at most one update per
+    room per coalescing interval, so a voting flood produces one emit
+    (with the newest snapshot) instead of one per vote.
+
+    Args:
+        poll_code: The poll room to broadcast to
+        poll_results: The results snapshot to send
+    """
+    _pending_broadcasts[poll_code] = poll_results
+
+    if poll_code not in _scheduled_broadcasts:
+        _scheduled_broadcasts.add(poll_code)
+        socketio.start_background_task(_flush_broadcast, poll_code)
+
+
+def _flush_broadcast(poll_code):
+    """Emit the latest pending snapshot for a room after the coalescing delay."""
+    socketio.sleep(BROADCAST_COALESCE_SECONDS)
+    _scheduled_broadcasts.discard(poll_code)
+    poll_results = _pending_broadcasts.pop(poll_code, None)
+
+    if poll_results is not None:
+        # Encode once here instead of per recipient; the client
+        # JSON-parses string payloads
+        payload = _dumps(poll_results)
+        _last_broadcast[poll_code] = payload
+        socketio.emit('vote_update', payload, room=poll_code)
+
 
 def create_app(config=None):
     """
@@ -57,6 +150,8 @@ def create_app(config=None):
     Returns:
         Flask application instance
     """
+    global SessionLocal
+
     app = Flask(__name__)
 
     # Load configuration
@@ -72,6 +167,11 @@ def create_app(config=None):
     app.db_engine = engine
     app.db_session = SessionLocal
 
+    # Return the scoped session to the pool at the end of each request
+    @app.teardown_appcontext
+    def remove_session(exception=None):
+        SessionLocal.remove()
+
     # Initialize SocketIO
     socketio.init_app(app, message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE'))
 
@@ -90,7 +190,7 @@ def create_app(config=None):
 
 
 def get_db_session():
-    """Get a new database session."""
+    """Get the scoped database session for the current greenlet/thread."""
     return SessionLocal()
 
 
@@ -113,16 +213,10 @@ def register_routes(app, SessionLocal):
             flash('Too many requests. Please try again later.', 'error')
             return render_template('create_poll.html')
 
-        # Get form data
+        # Get form data; option inputs all share the name "option[]"
+        # so one getlist call returns them in order
         question = request.form.get('question', '').strip()
-        options = []
-
-        # Parse options from form (options[] can be multiple)
-        for key in request.form:
-            if key.startswith('option_'):
-                value = request.form.get(key, '').strip()
-                if value:
-                    options.append(value)
+        options = [v.strip() for v in request.form.getlist('option[]') if v.strip()]
 
         # Create poll service
         db_session = SessionLocal()
@@ -151,8 +245,6 @@ def register_routes(app, SessionLocal):
             logger.error(f"Error creating poll: {e}")
             flash('An error occurred. Please try again.', 'error')
             return render_template('create_poll.html')
-        finally:
-            db_session.close()
 
     @app.route('/poll/<poll_code>')
     def view_poll(poll_code):
@@ -165,19 +257,18 @@ def register_routes(app, SessionLocal):
             if not poll:
                 return render_template('404.html', poll_code=poll_code), 404
 
-            # Check if user has already voted
+            # Check if user has already voted; fetch just the column
+            # instead of hydrating a full Vote row
             browser_token = request.cookies.get('browser_token')
-            has_voted = False
             voted_option_id = None
 
             if browser_token:
-                existing_vote = db_session.query(Vote).filter(
+                voted_option_id = db_session.query(Vote.option_id).filter(
                     Vote.poll_id == poll.id,
                     Vote.browser_token == browser_token
-                ).first()
-                if existing_vote:
-                    has_voted = True
-                    voted_option_id = existing_vote.option_id
+                ).scalar()
+
+            has_voted = voted_option_id is not None
 
             # Get results for display
             results = poll_service.get_results(poll_code)
@@ -206,8 +297,6 @@ def register_routes(app, SessionLocal):
         except Exception as e:
             logger.error(f"Error viewing poll: {e}")
             return render_template('404.html', poll_code=poll_code), 404
-        finally:
-            db_session.close()
 
     @app.route('/poll/<poll_code>/share')
     def share_poll(poll_code):
@@ -232,19 +321,15 @@ def register_routes(app, SessionLocal):
         except Exception as e:
             logger.error(f"Error loading share page: {e}")
             return render_template('404.html', poll_code=poll_code), 404
-        finally:
-            db_session.close()
 
     @app.route('/poll/<poll_code>/vote', methods=['POST'])
     def submit_vote(poll_code):
         """Submit a vote for a poll."""
-        # Get client info
+        # Get client info; read the cookie once so we know whether the
+        # token came from the client or was auto-generated here
         ip_address = request.remote_addr or '127.0.0.1'
-        browser_token = request.cookies.get('browser_token')
-
-        # Auto-generate token if not exists
-        if not browser_token:
-            browser_token = generate_browser_token()
+        incoming_token = request.cookies.get('browser_token')
+        browser_token = incoming_token or generate_browser_token()
 
         # Get vote data
         data = request.get_json() or {}
@@ -278,17 +363,20 @@ def register_routes(app, SessionLocal):
                 browser_token=browser_token
             )
 
-            # Broadcast update via WebSocket
-            poll_results = poll_service.get_results(poll_code.upper())
-            socketio.emit('vote_update', poll_results, room=poll_code.upper())
+            # Broadcast update via WebSocket using the payload already
+            # built by submit_vote (no extra DB round-trip); broadcasts
+            # are coalesced per room to survive voting floods
+            poll_results = result['results']
+            _results_cache.pop(poll_code.upper(), None)
+            schedule_broadcast(poll_code.upper(), poll_results)
 
             response = jsonify({
                 'success': True,
                 'results': poll_results
             })
 
-            # Set cookie if not exists
-            if 'browser_token' not in request.cookies:
+            # Set cookie exactly when we auto-generated the token
+            if incoming_token is None:
                 response.set_cookie(
                     'browser_token',
                     browser_token,
@@ -308,24 +396,19 @@ def register_routes(app, SessionLocal):
         except Exception as e:
             logger.error(f"Error submitting vote: {e}")
             return jsonify({'success': False, 'error': 'Failed to submit vote'}), 500
-        finally:
-            db_session.close()
 
     @app.route('/poll/<poll_code>/results')
     def get_results(poll_code):
         """Get poll results as JSON (for polling fallback)."""
         db_session = SessionLocal()
         try:
-            poll_service = PollService(db_session)
-            results = poll_service.get_results(poll_code.upper())
+            results = get_cached_results(poll_code.upper(), db_session)
             return jsonify(results)
         except PollNotFoundError:
             return jsonify({'error': 'Poll not found'}), 404
         except Exception as e:
             logger.error(f"Error getting results: {e}")
             return jsonify({'error': 'Failed to get results'}), 500
-        finally:
-            db_session.close()
 
     @app.route('/health')
     def health_check():
@@ -384,17 +467,23 @@ def register_socket_handlers():
         if not poll_code:
             return
 
-        # Get results from database
+        # Serve the last broadcast snapshot when available so reconnect
+        # storms on a busy poll don't each hit the database
+        last_results = _last_broadcast.get(poll_code)
+        if last_results is not None:
+            emit('vote_update', last_results, room=request.sid)
+            return
+
+        # Cold start for this room - fall back to the database
         db_session = get_db_session()
         try:
-            poll_service = PollService(db_session)
-            results = poll_service.get_results(poll_code)
+            results = get_cached_results(poll_code, db_session)
             emit('vote_update', results, room=request.sid)
         except Exception as e:
             logger.error(f"Error getting results for socket: {e}")
             emit('error', {'message': 'Failed to get results'}, room=request.sid)
         finally:
-            db_session.close()
+            SessionLocal.remove()
 
 
 def register_error_handlers(app):
@@ -421,9 +510,6 @@ def register_error_handlers(app):
 # Create the application
 app = create_app()
 
-# Import make_response for cookie handling
-from flask import make_response
-
 if __name__ == '__main__':
     # Run with SocketIO support
     socketio.run(
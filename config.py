@@ -43,6 +43,8 @@ class Config:
     RATE_LIMIT_ENABLED = True
     RATE_LIMIT_REQUESTS = 10  # Maximum requests per window
     RATE_LIMIT_WINDOW = 60  # Time window in seconds
+    # Optional Redis backend so limits are shared across workers
+    RATE_LIMIT_REDIS_URL = os.environ.get('RATE_LIMIT_REDIS_URL', None)
 
     # Poll Configuration
     POLL_CODE_LENGTH = 8
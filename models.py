@@ -5,13 +5,13 @@ This module defines the SQLAlchemy ORM models for Poll, Option, and Vote entitie
 Includes proper relationships, indexes, and constraints for data integrity.
 """
 
+import secrets
 import uuid
-import datetime
 from sqlalchemy import (
     create_engine, Column, Integer, String, DateTime,
-    ForeignKey, UniqueConstraint, Index, func
+    ForeignKey, UniqueConstraint, Index, func, event
 )
-from sqlalchemy.orm import relationship, declarative_base, sessionmaker
+from sqlalchemy.orm import relationship, declarative_base, sessionmaker, scoped_session
 
 # Create declarative base for model definitions
 Base = declarative_base()
@@ -35,7 +35,9 @@ class Poll(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     question = Column(String(500), nullable=False)
     poll_code = Column(String(8), unique=True, nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    # Filled in by the database; avoids a Python call + bound parameter
+    # per INSERT
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
 
     # Relationships
     options = relationship(
@@ -102,9 +104,11 @@ class Option(Base):
     option_text = Column(String(200), nullable=False)
     vote_count = Column(Integer, default=0, nullable=False)
 
-    # Relationships
+    # Relationships. votes is never traversed on the serving paths;
+    # lazy='raise' makes any future accidental per-row load fail loudly
+    # instead of silently emitting N+1 queries.
     poll = relationship('Poll', back_populates='options')
-    votes = relationship('Vote', back_populates='option')
+    votes = relationship('Vote', back_populates='option', lazy='raise')
 
     # Table-level constraints
     __table_args__ = (
@@ -150,32 +154,32 @@ class Vote(Base):
     poll_id = Column(
         Integer,
         ForeignKey('polls.id', ondelete='CASCADE'),
-        nullable=False,
-        index=True
+        nullable=False
     )
     option_id = Column(
         Integer,
         ForeignKey('options.id', ondelete='CASCADE'),
-        nullable=False,
-        index=True
+        nullable=False
     )
     ip_address = Column(String(45), nullable=False)  # IPv6 compatible
     browser_token = Column(String(36), nullable=False)  # UUID format
-    timestamp = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
-
-    # Relationships
-    poll = relationship('Poll', back_populates='votes')
-    option = relationship('Option', back_populates='votes')
-
-    # Table-level constraints
+    timestamp = Column(DateTime, server_default=func.now(), nullable=False)
+
+    # Relationships. Nothing traverses vote.poll/vote.option; force any
+    # new caller to pick an explicit loader strategy rather than
+    # lazy-loading one SELECT per row.
+    poll = relationship('Poll', back_populates='votes', lazy='raise')
+    option = relationship('Option', back_populates='votes', lazy='raise')
+
+    # Table-level constraints. The two unique constraints double as
+    # composite indexes covering every hot lookup (poll_id + ip/token),
+    # so no standalone indexes are needed - each extra index is another
+    # write per vote.
     __table_args__ = (
         # Prevent duplicate votes from same IP per poll
         UniqueConstraint('poll_id', 'ip_address', name='uq_vote_poll_ip'),
         # Prevent duplicate votes from same browser token per poll
         UniqueConstraint('poll_id', 'browser_token', name='uq_vote_poll_token'),
-        Index('idx_vote_poll_id', 'poll_id'),
-        Index('idx_vote_ip', 'ip_address'),
-        Index('idx_vote_token', 'browser_token'),
     )
 
     def __repr__(self):
@@ -209,29 +213,51 @@ def init_db(database_url='sqlite:///polls.db'):
     Returns:
         tuple: (engine, SessionLocal)
     """
-    engine = create_engine(
-        database_url,
-        echo=False,
-        pool_pre_ping=True,
-        pool_recycle=3600
-    )
+    engine_kwargs = {
+        'echo': False,
+        'pool_pre_ping': True,
+        'pool_recycle': 3600
+    }
+
+    # Size the pool for gevent workers (many greenlets per process);
+    # SQLite manages its own pooling and rejects these arguments
+    if not database_url.startswith('sqlite'):
+        engine_kwargs['pool_size'] = 20
+        engine_kwargs['max_overflow'] = 40
+
+    engine = create_engine(database_url, **engine_kwargs)
+
+    # SQLite ships with a rollback journal and synchronous=FULL, which
+    # fsyncs twice per vote and blocks readers during writes. WAL lets
+    # readers proceed alongside writers and NORMAL halves the fsyncs -
+    # a large write-throughput win for this vote-heavy workload.
+    if engine.url.get_backend_name() == 'sqlite':
+        @event.listens_for(engine, 'connect')
+        def set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA mmap_size=268435456")
+            cursor.close()
 
     # Create all tables
     Base.metadata.create_all(bind=engine)
 
-    # Create session factory
-    SessionLocal = sessionmaker(
+    # Scoped session factory: requests share one session per greenlet/
+    # thread instead of opening and closing a session per route
+    SessionLocal = scoped_session(sessionmaker(
         autocommit=False,
         autoflush=False,
         bind=engine
-    )
+    ))
 
     return engine, SessionLocal
 
 
 def generate_poll_code(length=8):
     """
-    Generate a unique poll code using UUID.
+    Generate a unique poll code.
 
     Args:
         length: Length of the code to generate
@@ -239,15 +265,18 @@ def generate_poll_code(length=8):
     Returns:
         str: Unique poll code
     """
-    # Use UUID4 and remove dashes, then take first 'length' characters
-    return uuid.uuid4().hex[:length].upper()
+    # Draw exactly the bytes needed (2 hex chars per byte) instead of
+    # generating a full UUID and discarding most of it
+    return secrets.token_hex(length // 2).upper()
 
 
 def generate_browser_token():
     """
-    Generate a unique browser token (UUID).
+    Generate a unique browser token (UUID format).
 
     Returns:
         str: UUID string
     """
-    return str(uuid.uuid4())
+    # Build the UUID straight from random bytes; uuid.uuid4() adds a
+    # fork-safety check that costs under high concurrency
+    return str(uuid.UUID(bytes=secrets.token_bytes(16), version=4))
@@ -10,19 +10,76 @@ This module contains all business logic for poll operations including:
 
 import logging
 import re
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func
+from sqlalchemy import func, insert, update, bindparam, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from models import Poll, Option, Vote, generate_poll_code
 
+# Optional Redis support for multi-worker rate limiting
+try:
+    import redis
+except ImportError:
+    redis = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Precompiled Core statements for the vote hot path - built once at
+# import instead of per request, and executed without ORM object
+# materialization
+_INCREMENT_VOTE_COUNT = (
+    update(Option)
+    .where(Option.id == bindparam('oid'))
+    .values(vote_count=Option.vote_count + 1)
+)
+_INSERT_VOTE = insert(Vote)
+
+# Dialect-specific INSERT .. ON CONFLICT DO NOTHING .. RETURNING for
+# votes, built once per dialect. Detects a duplicate vote in the same
+# statement as the insert - no pre-check and no exception/rollback
+# cycle on the common duplicate case.
+_INSERT_VOTE_ON_CONFLICT: Dict[str, Any] = {}
+
+
+def _vote_insert_on_conflict(dialect_name: str):
+    """Get the ON CONFLICT vote insert for a dialect, or None if unsupported."""
+    if dialect_name not in _INSERT_VOTE_ON_CONFLICT:
+        if dialect_name == 'postgresql':
+            stmt = pg_insert(Vote).on_conflict_do_nothing().returning(Vote.id)
+        elif dialect_name == 'sqlite':
+            stmt = sqlite_insert(Vote).on_conflict_do_nothing().returning(Vote.id)
+        else:
+            stmt = None
+        _INSERT_VOTE_ON_CONFLICT[dialect_name] = stmt
+    return _INSERT_VOTE_ON_CONFLICT[dialect_name]
+
+# poll_code -> poll id cache. The mapping is immutable once a poll is
+# created, so entries never go stale; the size cap just bounds memory.
+_POLL_ID_CACHE: Dict[str, int] = {}
+_POLL_ID_CACHE_MAX = 4096
+
+# Compiled once at import; generate_poll_code only emits 8 hex/alnum
+# uppercase chars, so anything else can skip the DB lookup entirely
+_POLL_CODE_RE = re.compile(r'^[A-Z0-9]{8}$')
+
+# Atomic INCR + EXPIRE for one rate-limit window bucket; returns the
+# request count so the caller can compare against the limit
+_RATE_LIMIT_LUA = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
 
 class PollServiceError(Exception):
     """Base exception for poll service errors."""
@@ -51,22 +108,62 @@ class RateLimitError(PollServiceError):
 
 class RateLimiter:
     """
-    In-memory rate limiter using sliding window algorithm.
-
-    Tracks requests per IP address within a configurable time window.
+    In-memory rate limiter using a token bucket per IP address.
+
+    Each IP gets a bucket that refills continuously at
+    max_requests / window_seconds tokens per second. Checks are O(1)
+    and state per IP is two floats, instead of the O(n) timestamp log
+    a sliding-window implementation keeps.
+
+    When a redis_url is configured (and the redis package is installed),
+    counters live in Redis via an atomic INCR+EXPIRE script so all
+    gunicorn workers enforce one shared limit. Without it, state is
+    per-process — fine for development, but N workers each allow the
+    full limit.
     """
 
-    def __init__(self, max_requests: int = 10, window_seconds: int = 60):
+    def __init__(
+        self,
+        max_requests: int = 10,
+        window_seconds: int = 60,
+        redis_url: Optional[str] = None
+    ):
         """
         Initialize rate limiter.
 
         Args:
             max_requests: Maximum requests allowed in the window
             window_seconds: Time window in seconds
+            redis_url: Optional Redis URL for shared state across workers
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self._requests: Dict[str, List[float]] = {}
+        self.refill_rate = max_requests / window_seconds
+        self.capacity = float(max_requests)
+        # Per-IP state is a 2-slot [tokens, last_refill] list mutated in
+        # place, so steady-state checks allocate nothing. Buckets are
+        # sharded with a lock per shard: unrelated IPs land on
+        # different locks and never contend.
+        self._nshards = 64
+        self._shard_mask = self._nshards - 1
+        self._shards = [
+            ({}, threading.Lock()) for _ in range(self._nshards)
+        ]
+        self._last_sweep = time.monotonic()
+
+        self._redis = None
+        self._rate_limit_script = None
+        if redis_url:
+            if redis is None:
+                logger.warning(
+                    "redis_url configured but redis package not installed; "
+                    "falling back to in-process rate limiting"
+                )
+            else:
+                self._redis = redis.Redis.from_url(redis_url)
+                self._rate_limit_script = self._redis.register_script(
+                    _RATE_LIMIT_LUA
+                )
 
     def is_allowed(self, ip_address: str) -> bool:
         """
@@ -78,42 +175,99 @@ class RateLimiter:
         Returns:
             bool: True if allowed, False if rate limited
         """
-        current_time = time.time()
-        window_start = current_time - self.window_seconds
-
-        # Get or initialize request list for this IP
-        if ip_address not in self._requests:
-            self._requests[ip_address] = []
-
-        # Filter out old requests outside the window
-        self._requests[ip_address] = [
-            req_time for req_time in self._requests[ip_address]
-            if req_time > window_start
-        ]
-
-        # Check if under limit
-        if len(self._requests[ip_address]) >= self.max_requests:
-            return False
+        if self._redis is not None:
+            return self._is_allowed_redis(ip_address)
+
+        now = time.monotonic()
+        window = self.window_seconds
+
+        # Amortized sweep: an IP idle for a full window is back at full
+        # capacity anyway, so its bucket carries no information. Evict
+        # such entries so a flood of unique IPs can't grow the dicts
+        # without bound.
+        if now - self._last_sweep > window:
+            self._last_sweep = now
+            self._sweep(now - window)
+
+        capacity = self.capacity
+        buckets, lock = self._shards[hash(ip_address) & self._shard_mask]
+        with lock:
+            bucket = buckets.get(ip_address)
+            if bucket is None:
+                bucket = buckets.setdefault(ip_address, [capacity, now])
+
+            # Refill inlined (mirrors _refill) so the per-request path
+            # works on locals instead of repeated attribute lookups
+            tokens = bucket[0] + (now - bucket[1]) * self.refill_rate
+            if tokens > capacity:
+                tokens = capacity
+            bucket[1] = now
+
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return True
+
+            bucket[0] = tokens
+
+        return False
+
+    def _sweep(self, cutoff: float) -> None:
+        """Drop buckets whose last refill is older than the cutoff."""
+        for buckets, lock in self._shards:
+            with lock:
+                for ip, bucket in list(buckets.items()):
+                    if bucket[1] <= cutoff:
+                        del buckets[ip]
+
+    def _refill(self, bucket: List[float], now: float) -> None:
+        """Lazily refill a bucket in place based on elapsed time."""
+        bucket[0] = min(
+            self.capacity,
+            bucket[0] + (now - bucket[1]) * self.refill_rate
+        )
+        bucket[1] = now
+
+    def _is_allowed_redis(self, ip_address: str) -> bool:
+        """Check the shared Redis counter; fail open on Redis errors."""
+        key = self._redis_key(ip_address)
+        try:
+            count = self._rate_limit_script(
+                keys=[key], args=[self.window_seconds]
+            )
+            return int(count) <= self.max_requests
+        except redis.RedisError as e:
+            logger.error(f"Rate limit Redis check failed: {e}")
+            return True
 
-        # Add current request
-        self._requests[ip_address].append(current_time)
-        return True
+    def _redis_key(self, ip_address: str) -> str:
+        """Build the Redis key for the current window bucket."""
+        window_bucket = int(time.time() // self.window_seconds)
+        return f"rl:{ip_address}:{window_bucket}"
 
     def get_remaining(self, ip_address: str) -> int:
         """Get remaining requests for an IP."""
-        if ip_address not in self._requests:
-            return self.max_requests
+        if self._redis is not None:
+            try:
+                count = int(self._redis.get(self._redis_key(ip_address)) or 0)
+                return max(0, self.max_requests - count)
+            except redis.RedisError as e:
+                logger.error(f"Rate limit Redis check failed: {e}")
+                return self.max_requests
 
-        current_time = time.time()
-        window_start = current_time - self.window_seconds
+        buckets, lock = self._shards[hash(ip_address) & self._shard_mask]
+        with lock:
+            bucket = buckets.get(ip_address)
+            if bucket is None:
+                return self.max_requests
 
-        # Filter out old requests
-        recent_requests = [
-            req_time for req_time in self._requests[ip_address]
-            if req_time > window_start
-        ]
+            self._refill(bucket, time.monotonic())
+            return int(bucket[0])
 
-        return max(0, self.max_requests - len(recent_requests))
+
+# Shared fallback limiter. Services constructed without an explicit
+# limiter must all see the same state - a fresh RateLimiter per request
+# would never accumulate enough history to enforce anything.
+_default_rate_limiter = RateLimiter()
 
 
 class PollService:
@@ -132,7 +286,7 @@ class PollService:
             rate_limiter: Rate limiter instance
         """
         self.db = db_session
-        self.rate_limiter = rate_limiter or RateLimiter()
+        self.rate_limiter = rate_limiter or _default_rate_limiter
 
     def create_poll(
         self,
@@ -177,8 +331,9 @@ class PollService:
         if len(options) > max_options:
             raise ValidationError(f"Maximum {max_options} options allowed")
 
-        # Clean and validate each option
-        cleaned_options = []
+        # Clean, validate and dedupe in a single pass; the dict keeps
+        # insertion order and doubles as the duplicate check
+        seen = {}
         for opt in options:
             opt = opt.strip()
             if not opt:
@@ -187,54 +342,44 @@ class PollService:
                 raise ValidationError(
                     f"Each option must be {max_option_length} characters or less"
                 )
-            cleaned_options.append(opt)
-
-        # Check for duplicate options
-        if len(cleaned_options) != len(set(cleaned_options)):
-            raise ValidationError("Options must be unique")
-
-        # Generate unique poll code
-        poll_code = self._generate_unique_poll_code()
-
-        # Create poll
-        poll = Poll(question=question, poll_code=poll_code)
-
-        # Add options
-        for opt_text in cleaned_options:
-            option = Option(option_text=opt_text, vote_count=0)
-            poll.options.append(option)
-
-        # Save to database
-        try:
-            self.db.add(poll)
-            self.db.commit()
-            self.db.refresh(poll)
-            logger.info(f"Created poll with code: {poll_code}")
-            return poll
-        except IntegrityError:
-            self.db.rollback()
-            # Code collision - try again (rare)
-            return self.create_poll(question, options, min_options, max_options)
-
-    def _generate_unique_poll_code(self) -> str:
-        """
-        Generate a unique poll code.
-
-        Returns:
-            str: Unique poll code
-
-        Raises:
-            ValidationError: If unable to generate unique code after retries
-        """
-        max_attempts = 10
-        for _ in range(max_attempts):
-            code = generate_poll_code(8)
-            # Check if code exists
-            existing = self.db.query(Poll).filter_by(poll_code=code).first()
-            if not existing:
-                return code
-
-        raise ValidationError("Unable to generate unique poll code")
+            if opt in seen:
+                raise ValidationError("Options must be unique")
+            seen[opt] = None
+
+        cleaned_options = list(seen)
+
+        # Let the unique index on poll_code arbitrate collisions: insert
+        # directly and regenerate only if the constraint fires, instead
+        # of probing with a SELECT first. Happy path is one round-trip.
+        for _ in range(5):
+            poll = Poll(question=question, poll_code=generate_poll_code(8))
+
+            try:
+                self.db.add(poll)
+                # Assigns poll.id; a code collision surfaces here
+                self.db.flush()
+
+                # One multi-row INSERT for the options instead of N
+                # relationship appends flushed statement by statement
+                self.db.bulk_insert_mappings(Option, [
+                    {
+                        'poll_id': poll.id,
+                        'option_text': opt_text,
+                        'vote_count': 0
+                    }
+                    for opt_text in cleaned_options
+                ])
+
+                self.db.commit()
+                self.db.refresh(poll)
+                logger.info(f"Created poll with code: {poll.poll_code}")
+                return poll
+            except IntegrityError:
+                # Code collision (rare) - retry with a fresh code
+                self.db.rollback()
+
+        # Not a user-input problem, so not a ValidationError
+        raise PollServiceError("Poll code generation exhausted")
 
     def get_poll_by_code(self, poll_code: str) -> Optional[Poll]:
         """
@@ -246,7 +391,35 @@ class PollService:
         Returns:
             Poll or None if not found
         """
-        return self.db.query(Poll).filter_by(poll_code=poll_code).first()
+        # Obviously malformed codes can't exist - skip the round-trip
+        if not _POLL_CODE_RE.match(poll_code):
+            return None
+
+        # Known codes resolve straight to a primary-key get, which hits
+        # the session identity map / PK index instead of the code index
+        poll_id = _POLL_ID_CACHE.get(poll_code)
+        if poll_id is not None:
+            return self.db.get(
+                Poll, poll_id, options=[joinedload(Poll.options)]
+            )
+
+        # Eager-load options so callers iterating poll.options don't
+        # trigger a lazy-load query per access (classic N+1). joinedload
+        # over selectinload: this fetches a single poll, so one JOINed
+        # round-trip beats a second IN-query for its handful of options.
+        poll = (
+            self.db.query(Poll)
+            .options(joinedload(Poll.options))
+            .filter_by(poll_code=poll_code)
+            .first()
+        )
+
+        if poll is not None:
+            if len(_POLL_ID_CACHE) >= _POLL_ID_CACHE_MAX:
+                _POLL_ID_CACHE.clear()
+            _POLL_ID_CACHE[poll_code] = poll.id
+
+        return poll
 
     def get_poll_or_404(self, poll_code: str) -> Poll:
         """
@@ -288,22 +461,21 @@ class PollService:
         if not poll:
             return False, "Poll not found"
 
-        # Check IP restriction
-        existing_ip_vote = self.db.query(Vote).filter(
-            Vote.poll_id == poll.id,
-            Vote.ip_address == ip_address
-        ).first()
-
-        if existing_ip_vote:
-            return False, "You have already voted from this IP address"
-
-        # Check browser token restriction
-        existing_token_vote = self.db.query(Vote).filter(
+        # Both fairness rules in one round-trip; branch on which
+        # column matched for the error message
+        existing = self.db.query(
+            Vote.ip_address, Vote.browser_token
+        ).filter(
             Vote.poll_id == poll.id,
-            Vote.browser_token == browser_token
+            or_(
+                Vote.ip_address == ip_address,
+                Vote.browser_token == browser_token
+            )
         ).first()
 
-        if existing_token_vote:
+        if existing:
+            if existing.ip_address == ip_address:
+                return False, "You have already voted from this IP address"
             return False, "You have already voted"
 
         return True, None
@@ -325,14 +497,15 @@ class PollService:
             browser_token: Browser identifier token
 
         Returns:
-            dict: Result with success status and poll data
+            dict: Result with success status and updated results payload
 
         Raises:
             PollNotFoundError: If poll doesn't exist
             ValidationError: If option is invalid
             DuplicateVoteError: If user already voted
         """
-        # Get poll
+        # Get poll (options come back eagerly loaded, which the results
+        # payload below relies on)
         poll = self.get_poll_by_code(poll_code)
         if not poll:
             raise PollNotFoundError(f"Poll not found")
@@ -346,58 +519,63 @@ class PollService:
         if not option:
             raise ValidationError("Invalid option selected")
 
-        # Check for duplicate vote (fairness)
-        existing_vote = self.db.query(Vote).filter(
-            Vote.poll_id == poll.id,
-            Vote.ip_address == ip_address
-        ).first()
-
-        if existing_vote:
-            raise DuplicateVoteError("You have already voted from this IP address")
-
-        existing_token_vote = self.db.query(Vote).filter(
-            Vote.poll_id == poll.id,
-            Vote.browser_token == browser_token
-        ).first()
+        # No pre-flight duplicate SELECT: the unique constraints on
+        # (poll_id, ip_address) and (poll_id, browser_token) are the
+        # fairness check. Check-then-insert would race under concurrent
+        # votes anyway; the constraint violation below is atomic.
+        vote_params = {
+            'poll_id': poll.id,
+            'option_id': option_id,
+            'ip_address': ip_address,
+            'browser_token': browser_token
+        }
 
-        if existing_token_vote:
-            raise DuplicateVoteError("You have already voted")
+        # Snapshot results from the already-loaded options now - commit
+        # expires ORM state, so reading the poll afterwards would
+        # re-SELECT everything just to learn what we already know
+        results = self._build_results(poll)
 
         try:
-            # Create vote record
-            vote = Vote(
-                poll_id=poll.id,
-                option_id=option_id,
-                ip_address=ip_address,
-                browser_token=browser_token
-            )
-
-            # Atomic increment of vote count
-            # Use direct SQL update for atomicity
-            from sqlalchemy import update
-            stmt = (
-                update(Option)
-                .where(Option.id == option_id)
-                .values(vote_count=Option.vote_count + 1)
-            )
-            self.db.execute(stmt)
-
-            # Add vote record
-            self.db.add(vote)
+            conflict_stmt = _vote_insert_on_conflict(self.db.bind.dialect.name)
+            if conflict_stmt is not None:
+                # Single statement: insert unless a fairness constraint
+                # conflicts; RETURNING tells us which happened
+                inserted_id = self.db.execute(conflict_stmt, vote_params).scalar()
+                if inserted_id is None:
+                    self.db.rollback()
+                    raise DuplicateVoteError("You have already voted")
+
+                self.db.execute(_INCREMENT_VOTE_COUNT, {'oid': option_id})
+            else:
+                # Dialects without ON CONFLICT: plain insert, with the
+                # IntegrityError handler below flagging duplicates
+                self.db.execute(_INCREMENT_VOTE_COUNT, {'oid': option_id})
+                self.db.execute(_INSERT_VOTE, vote_params)
 
             # Commit transaction
             self.db.commit()
 
             logger.info(f"Vote submitted: poll={poll_code}, option={option_id}, ip={ip_address}")
 
-            # Return updated poll data
-            self.db.refresh(poll)
+            # Apply the committed vote to the snapshot in memory - we
+            # know exactly which option moved and by how much
+            results['total_votes'] += 1
+            total_votes = results['total_votes']
+            for opt in results['options']:
+                if opt['id'] == option_id:
+                    opt['vote_count'] += 1
+                opt['percentage'] = round(
+                    opt['vote_count'] / total_votes * 100, 1
+                )
+
             return {
                 'success': True,
-                'poll': poll.to_dict(),
+                'results': results,
                 'voted_option_id': option_id
             }
 
+        except DuplicateVoteError:
+            raise
         except IntegrityError as e:
             self.db.rollback()
             logger.error(f"Integrity error during vote: {e}")
@@ -420,10 +598,66 @@ class PollService:
         Raises:
             PollNotFoundError: If poll doesn't exist
         """
-        poll = self.get_poll_by_code(poll_code)
-        if not poll:
+        if not _POLL_CODE_RE.match(poll_code):
             raise PollNotFoundError("Poll not found")
 
+        # Read-only path: fetch plain tuples instead of hydrating Poll
+        # and Option ORM objects that are immediately discarded
+        poll_row = self.db.query(
+            Poll.id, Poll.question, Poll.created_at
+        ).filter_by(poll_code=poll_code).first()
+
+        if poll_row is None:
+            raise PollNotFoundError("Poll not found")
+
+        option_rows = self.db.query(
+            Option.id, Option.option_text, Option.vote_count
+        ).filter_by(poll_id=poll_row.id).order_by(Option.id).all()
+
+        # One pass over the tuples gives the total; no separate SUM query
+        total_votes = sum(row.vote_count for row in option_rows)
+
+        if total_votes == 0:
+            # Common for brand-new polls: emit zeros directly instead
+            # of dividing and rounding per option
+            options_data = [
+                {
+                    'id': opt_id,
+                    'option_text': opt_text,
+                    'vote_count': 0,
+                    'percentage': 0.0
+                }
+                for opt_id, opt_text, _ in option_rows
+            ]
+        else:
+            options_data = []
+            for opt_id, opt_text, vote_count in option_rows:
+                percentage = vote_count / total_votes * 100
+                options_data.append({
+                    'id': opt_id,
+                    'option_text': opt_text,
+                    'vote_count': vote_count,
+                    'percentage': round(percentage, 1)
+                })
+
+        return {
+            'poll_code': poll_code,
+            'question': poll_row.question,
+            'total_votes': total_votes,
+            'options': options_data,
+            'created_at': poll_row.created_at.isoformat() if poll_row.created_at else None
+        }
+
+    def _build_results(self, poll: Poll) -> Dict[str, Any]:
+        """
+        Build the results payload from an already-loaded poll.
+
+        Args:
+            poll: The poll with its options loaded
+
+        Returns:
+            dict: Results data including options with votes and percentages
+        """
         # Calculate total votes
         total_votes = sum(opt.vote_count for opt in poll.options)
 
@@ -439,7 +673,7 @@ class PollService:
             })
 
         return {
-            'poll_code': poll_code,
+            'poll_code': poll.poll_code,
             'question': poll.question,
             'total_votes': total_votes,
             'options': options_data,
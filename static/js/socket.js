@@ -93,9 +93,14 @@
 
     /**
      * Handle vote update from server
-     * @param {Object} data - Vote update data
+     * @param {Object|string} data - Vote update data (broadcasts arrive
+     *     pre-serialized as JSON strings)
      */
     function handleVoteUpdate(data) {
+        if (typeof data === 'string') {
+            data = JSON.parse(data);
+        }
+
         console.log('Received vote update:', data);
 
         // Check if updateResults function exists (defined in poll page)